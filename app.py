@@ -1,27 +1,63 @@
 # app.py
 
+import time
+_script_start = time.perf_counter()
+
 import streamlit as st
+_streamlit_imported = time.perf_counter()
+
 from backend import (
     speach_to_text, 
     generate_image_prompt, 
     generate_image_with_clipdrop,
     analyze_content_emotions,
     analyze_content_themes,
-    init_database,
+    analyze_content_emotions_with_source,
+    analyze_content_themes_with_source,
+    ensure_database,
     save_to_history,
     get_history,
-    delete_from_history
+    delete_from_history,
+    startup_profiling_enabled,
+    record_startup_timing,
+    get_startup_report
 )
 import tempfile
 import os
 from datetime import datetime
 import json
+_backend_imported = time.perf_counter()
 
-# Initialize database
-init_database()
+# Only the first run of the process pays for these imports; keep them for the startup report
+_cold_start = "import backend" not in dict(get_startup_report())
+if _cold_start:
+    record_startup_timing("import streamlit", _streamlit_imported - _script_start)
+    record_startup_timing("import backend", _backend_imported - _streamlit_imported)
+
+# Initialize database (once per process, not on every rerun)
+ensure_database()
+_setup_done = time.perf_counter()
 
 st.set_page_config(page_title="Audio to Image Generator", page_icon="🎨", layout="wide")
 
+# Startup profiling report, enabled with STARTUP_PROFILE=1. Rendered before the tabs so
+# that st.stop() or an error later in the run cannot skip it.
+if startup_profiling_enabled():
+    run_label = "cold start" if _cold_start else "rerun"
+    run_seconds = _setup_done - _script_start
+    startup_timings = get_startup_report()
+    
+    print(f"Startup profile (this run, {run_label}): imports and setup {run_seconds * 1000:.1f} ms")
+    print("Startup profile (one-time initialization):")
+    for label, seconds in startup_timings:
+        print(f"  {label}: {seconds * 1000:.1f} ms")
+    
+    with st.sidebar.expander("⏱️ Startup profile"):
+        st.markdown(f"**This run ({run_label}):** imports and setup {run_seconds * 1000:.1f} ms")
+        st.markdown("**One-time initialization:**")
+        for label, seconds in startup_timings:
+            st.write(f"{label}: {seconds * 1000:.1f} ms")
+
 st.title("🎨 Audio to Image Generator")
 st.markdown("Upload an audio file or record audio to generate an image based on your description!")
 
@@ -64,7 +100,7 @@ with tab1:
                     
                     with col1:
                         st.markdown("#### 😊 Emotional Analysis")
-                        emotion_analysis = analyze_content_emotions(transcribed_text)
+                        emotion_analysis, emotion_source = analyze_content_emotions_with_source(transcribed_text)
                         
                         # Display emotion analysis as progress bars
                         for emotion, score in emotion_analysis.items():
@@ -72,7 +108,7 @@ with tab1:
                     
                     with col2:
                         st.markdown("#### 🎯 Theme Analysis")
-                        theme_analysis = analyze_content_themes(transcribed_text)
+                        theme_analysis, theme_source = analyze_content_themes_with_source(transcribed_text)
                         
                         # Display theme analysis as progress bars
                         for theme, score in theme_analysis.items():
@@ -110,7 +146,12 @@ with tab1:
                             f.write(image_data)
                         
                         # Save to history database
-                        content_analysis = {"emotions": emotion_analysis, "themes": theme_analysis}
+                        # Record which scores came from Mistral; only those are used to calibrate the local classifier
+                        content_analysis = {
+                            "emotions": emotion_analysis,
+                            "themes": theme_analysis,
+                            "sources": {"emotions": emotion_source, "themes": theme_source}
+                        }
                         generation_id = save_to_history(
                             transcribed_text, 
                             emotion_analysis, 
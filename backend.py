@@ -2,18 +2,82 @@
 
 import base64
 import os
-from mistralai import Mistral
-from dotenv import load_dotenv
-from groq import Groq
+import importlib
 import json
 import math
 import tempfile
-import requests
+import time
 from datetime import datetime
 import sqlite3
 import uuid
+import re
+import unicodedata
 
-load_dotenv()
+# Provider SDKs (mistralai, groq, requests, dotenv) are imported on first use so that
+# importing this module stays cheap on Streamlit cold starts and reruns.
+_provider_modules = {}
+_clients = {}
+_environment_loaded = False
+_database_initialized = False
+_startup_timings = []
+
+def record_startup_timing(label, seconds):
+    """Record a one-time initialization step for the startup profiling report."""
+    _startup_timings.append((label, seconds))
+
+def get_startup_report():
+    """Return the recorded (label, seconds) initialization steps."""
+    return list(_startup_timings)
+
+def startup_profiling_enabled():
+    """Return True when the STARTUP_PROFILE environment flag is set."""
+    _load_environment()
+    return os.environ.get("STARTUP_PROFILE", "").lower() in ("1", "true", "yes")
+
+def _load_environment():
+    """Load the .env file once per process."""
+    global _environment_loaded
+    if _environment_loaded:
+        return
+
+    start = time.perf_counter()
+    from dotenv import load_dotenv
+    load_dotenv()
+    _environment_loaded = True
+    record_startup_timing("load .env", time.perf_counter() - start)
+
+def _lazy_import(module_name):
+    """Import a provider module on first use and record how long it took."""
+    if module_name not in _provider_modules:
+        start = time.perf_counter()
+        _provider_modules[module_name] = importlib.import_module(module_name)
+        record_startup_timing(f"import {module_name}", time.perf_counter() - start)
+    return _provider_modules[module_name]
+
+def get_mistral_client():
+    """Return a Mistral client, created once per process."""
+    _load_environment()
+    if "mistral" not in _clients:
+        _clients["mistral"] = _lazy_import("mistralai").Mistral(api_key=os.environ["MISTRAL_API_KEY"])
+    return _clients["mistral"]
+
+def get_groq_client():
+    """Return a Groq client, created once per process."""
+    _load_environment()
+    if "groq" not in _clients:
+        _clients["groq"] = _lazy_import("groq").Groq(api_key=os.environ["GROQ_API_KEY"])
+    return _clients["groq"]
+
+def ensure_database():
+    """Initialize the history database once per process."""
+    global _database_initialized
+    if _database_initialized:
+        return
+
+    start = time.perf_counter()
+    init_database()
+    _database_initialized = True
+    record_startup_timing("init database", time.perf_counter() - start)
 
 def init_database():
     """Initialize SQLite database for history."""
@@ -37,6 +101,7 @@ def init_database():
 
 def save_to_history(transcribed_text, emotion_analysis, generated_prompt, image_path, content_analysis):
     """Save generation data to history database."""
+    global _learned_weights
     conn = sqlite3.connect('audio_to_image_history.db')
     cursor = conn.cursor()
     
@@ -51,6 +116,9 @@ def save_to_history(transcribed_text, emotion_analysis, generated_prompt, image_
     conn.commit()
     conn.close()
     
+    # Recalibrate the local classifier with the new row on next use
+    _learned_weights = None
+    
     return generation_id
 
 def get_history(limit=10):
@@ -101,8 +169,250 @@ def softmax(predictions):
         output[sentiment] = math.exp(predicted_value*10) / sum([math.exp(value*10) for value in predictions.values()])
     return output
 
+# Local lexicon classifier used as a fast path before calling Mistral.
+# ANALYSIS_MODE: "auto" (local first, Mistral when unsure), "remote" (always Mistral)
+# or "offline" (never call Mistral, e.g. when quotas are exhausted).
+# Keywords are accent-free whole words; a trailing "*" marks a stem that matches as a prefix.
+EMOTION_LEXICON = {
+    "heureux": ["heureux", "heureuse", "heureuses", "joie", "joies", "joyeux", "joyeuse", "content", "contente",
+                "contents", "contentes", "ravi", "ravie", "ravis", "bonheur", "sourire", "souriant", "souriante",
+                "rire", "genial", "geniale", "magnifique", "magnifiques", "merveill*", "enchante", "enchantee",
+                "excite", "excitee", "excitant", "adore", "adorer", "fier", "fiere", "gai", "gaie"],
+    "anxieux": ["anxieux", "anxieuse", "anxiete", "angoiss*", "stress", "stresse", "stressee", "stressant",
+                "inquiet", "inquiete", "inquietude", "nerveux", "nerveuse", "tendu", "tendue", "souci", "soucis",
+                "preoccupe", "preoccupee", "apprehension", "apprehende"],
+    "triste": ["triste", "tristes", "tristesse", "malheureux", "malheureuse", "malheur", "deprime", "deprimee",
+               "deprimant", "depression", "pleure", "pleurer", "pleurs", "pleurais", "larme", "larmes", "chagrin",
+               "seul", "seule", "seuls", "seules", "melancolie", "melancolique", "decu", "decue", "regret",
+               "regrets", "regrette", "nostalgie", "nostalgique", "desespoir", "desespere", "desesperee"],
+    "en_colere": ["colere", "enerve", "enervee", "enervant", "furieux", "furieuse", "rage", "agace", "agacee",
+                  "agacant", "marre", "deteste", "detester", "hais", "haine", "insupportable", "enrage",
+                  "enragee", "fache", "fachee", "exaspere", "exasperee", "revolte", "revoltee", "revoltant"],
+    "fatigue": ["fatigue", "fatiguee", "fatigues", "fatigant", "fatigante", "epuise", "epuisee", "epuisant",
+                "epuisement", "creve", "crevee", "sommeil", "somnolent", "somnolence", "dormir", "dors", "las",
+                "lasse", "lassitude", "bailler", "baille", "harasse", "harassee"],
+    "apeure": ["peur", "peurs", "effraye", "effrayee", "effrayant", "effrayante", "terrifie", "terrifiee",
+               "terrifiant", "terrifiante", "terreur", "cauchemar", "cauchemars", "horreur", "horrible",
+               "horribles", "panique", "paniquer", "frayeur", "tremble", "trembler", "tremblais", "craint",
+               "crains", "crainte", "menace", "menacant", "menacante", "apeure", "apeuree"],
+}
+
+THEME_LEXICON = {
+    "nature": ["nature", "foret", "forets", "arbre", "arbres", "montagne", "montagnes", "mer", "ocean", "plage",
+               "riviere", "fleuve", "lac", "lacs", "fleur", "fleurs", "jardin", "ciel", "soleil", "nuage", "nuages",
+               "campagne", "champ", "champs", "prairie", "desert", "animal", "animaux", "oiseau", "oiseaux",
+               "paysage", "paysages", "herbe", "neige", "cascade", "vallee", "jungle", "lune", "etoile", "etoiles"],
+    "urbain": ["ville", "villes", "rue", "rues", "immeuble", "immeubles", "batiment", "batiments", "gratte",
+               "architecture", "metro", "voiture", "voitures", "trafic", "pont", "quartier", "building",
+               "buildings", "urbain", "urbaine", "boulevard", "avenue", "magasin", "magasins", "cafe", "bureau",
+               "gare", "usine", "neon", "neons", "trottoir"],
+    "personnes": ["homme", "hommes", "femme", "femmes", "enfant", "enfants", "fille", "filles", "garcon",
+                  "garcons", "famille", "ami", "amie", "amis", "amies", "gens", "visage", "visages", "portrait",
+                  "mere", "pere", "frere", "freres", "soeur", "soeurs", "bebe", "foule", "couple"],
+    "objets": ["objet", "objets", "table", "chaise", "livre", "livres", "tasse", "bouteille", "vase", "lampe",
+               "telephone", "ordinateur", "verre", "bol", "fruit", "fruits", "bougie", "horloge", "cle", "cles",
+               "sac", "chapeau"],
+    "abstrait": ["reve", "reves", "rever", "revais", "idee", "idees", "concept", "abstrait", "abstraite", "esprit",
+                 "ame", "infini", "infinie", "souvenir", "souvenirs", "imaginaire", "imagine", "imaginer",
+                 "surreel", "surrealiste", "symbole", "symbolique", "pensee", "pensees", "emotion", "emotions"],
+    "action": ["courir", "saute", "sauter", "danse", "danser", "vole", "voler", "combat", "bataille", "explosion",
+               "explose", "vitesse", "rapide", "rapidement", "poursuite", "poursuivi", "sport", "bouge", "bouger",
+               "mouvement", "tempete", "chute", "nage", "nager"],
+    "calme": ["calme", "paisible", "serein", "sereine", "tranquille", "tranquillement", "silence", "silencieux",
+              "silencieuse", "doux", "douce", "repos", "reposant", "zen", "meditation", "mediter", "medite", "lent",
+              "lente", "lentement", "immobile", "sieste", "apaisant", "apaisante", "apaise", "paix", "detente",
+              "detendu", "detendue"],
+}
+
+# A keyword preceded by one of these words within NEGATION_WINDOW tokens of the same clause is not counted
+NEGATION_WORDS = {"ne", "n", "pas", "jamais", "rien", "aucun", "aucune", "ni", "sans"}
+NEGATION_WINDOW = 3
+
+# Function words never learned as signals during calibration
+STOPWORDS = {
+    "alors", "aussi", "autre", "avais", "avait", "avant", "avec", "avoir", "bien", "cela", "celle", "celui",
+    "cette", "ceux", "chez", "comme", "comment", "dans", "depuis", "derriere", "devant", "donc", "elle",
+    "elles", "encore", "entre", "etais", "etait", "etre", "fait", "faire", "leur", "leurs", "mais", "meme",
+    "mes", "moins", "nous", "notre", "parce", "pour", "pourquoi", "quand", "quelque", "quelques", "sans",
+    "sont", "sous", "suis", "sur", "tellement", "tous", "tout", "toute", "toutes", "tres", "trop", "vers",
+    "voila", "vous", "votre", "juste", "vraiment", "chose", "choses", "quoi", "avons", "avez", "ont", "etions",
+}
+
+LOCAL_CONFIDENCE_THRESHOLD = 0.6
+# The top label needs at least this many keyword hits before the local result is trusted
+MIN_KEYWORD_HITS = 2
+# Expected number of tokens per keyword hit; sparser evidence in long transcripts lowers confidence
+TOKENS_PER_HIT = 15
+# Minimum increase of a label's average Mistral score for a word to be learned
+MIN_LEARNED_LIFT = 0.15
+_learned_weights = None
+
+def get_analysis_mode():
+    """Return the content analysis mode ("auto", "remote" or "offline")."""
+    _load_environment()
+    mode = os.environ.get("ANALYSIS_MODE", "auto").lower()
+    return mode if mode in ("auto", "remote", "offline") else "auto"
+
+def get_local_confidence_threshold():
+    """Return the confidence above which the local classifier is trusted."""
+    _load_environment()
+    try:
+        return float(os.environ.get("LOCAL_CONFIDENCE_THRESHOLD", LOCAL_CONFIDENCE_THRESHOLD))
+    except ValueError:
+        return LOCAL_CONFIDENCE_THRESHOLD
+
+def tokenize(text):
+    """Lowercase, strip accents and split French text into words."""
+    # NFD does not decompose the oe/ae ligatures, so spell them out first
+    text = text.lower().replace("œ", "oe").replace("æ", "ae")
+    text = unicodedata.normalize("NFD", text)
+    text = "".join(char for char in text if unicodedata.category(char) != "Mn")
+    return re.findall(r"[a-z]+", text)
+
+def split_clauses(text):
+    """Split text on punctuation and tokenize each clause."""
+    return [tokenize(clause) for clause in re.split(r"[,.;:!?]", text)]
+
+def _keyword_matches(token, keyword):
+    if keyword.endswith("*"):
+        return token.startswith(keyword[:-1])
+    return token == keyword
+
+def calibrate_local_classifier(limit=500):
+    """Learn per-word weights from the Mistral scores stored in the generations table.
+
+    Rows whose content_analysis records "local" as the source of a category are skipped,
+    so the classifier never trains on its own predictions. Rows without a source predate
+    the local classifier and therefore come from Mistral. The result is cached until the
+    next save_to_history call.
+    """
+    global _learned_weights
+
+    weights = {"emotions": {}, "themes": {}}
+    try:
+        # Read-only so that calibrating never creates an empty database file
+        conn = sqlite3.connect('file:audio_to_image_history.db?mode=ro', uri=True)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT transcribed_text, content_analysis FROM generations
+                ORDER BY timestamp DESC
+                LIMIT ?
+            ''', (limit,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        rows = []
+
+    for category in weights:
+        samples = []
+        for transcribed_text, content_analysis in rows:
+            if not transcribed_text or not content_analysis:
+                continue
+            try:
+                analysis = json.loads(content_analysis)
+                if analysis.get("sources", {}).get(category, "mistral") != "mistral":
+                    continue
+                scores = analysis.get(category) or {}
+            except (ValueError, AttributeError):
+                continue
+            if scores:
+                samples.append((set(tokenize(transcribed_text)), scores))
+        if not samples:
+            continue
+
+        # Average score of each label over the whole corpus, so frequent labels are not favoured
+        corpus_means = {}
+        for _, scores in samples:
+            for key, score in scores.items():
+                corpus_means[key] = corpus_means.get(key, 0.0) + score / len(samples)
+
+        # token -> [occurrences, {key: summed score}]
+        stats = {}
+        for tokens, scores in samples:
+            for token in tokens:
+                if len(token) < 4 or token in STOPWORDS:
+                    continue
+                token_stats = stats.setdefault(token, [0, {}])
+                token_stats[0] += 1
+                for key, score in scores.items():
+                    token_stats[1][key] = token_stats[1].get(key, 0.0) + score
+
+        # Keep words seen at least twice that raise a label's score well above its corpus average
+        for token, (count, sums) in stats.items():
+            if count < 2:
+                continue
+            token_weights = {}
+            for key, total in sums.items():
+                lift = total / count - corpus_means.get(key, 0.0)
+                if lift >= MIN_LEARNED_LIFT:
+                    token_weights[key] = lift
+            if token_weights:
+                weights[category][token] = token_weights
+
+    _learned_weights = weights
+    return weights
+
+def local_content_analysis(transcribed_text, lexicon, category):
+    """Score text against a keyword lexicon; returns (predictions, confidence)."""
+    if _learned_weights is None:
+        calibrate_local_classifier()
+    learned = _learned_weights.get(category, {})
+
+    clauses = split_clauses(transcribed_text or "")
+    token_count = sum(len(clause) for clause in clauses)
+    hits = {key: 0.0 for key in lexicon}
+    negated_hits = 0.0
+    for tokens in clauses:
+        for index, token in enumerate(tokens):
+            token_hits = {}
+            for key, keywords in lexicon.items():
+                if any(_keyword_matches(token, keyword) for keyword in keywords):
+                    token_hits[key] = token_hits.get(key, 0.0) + 1.0
+            for key, weight in learned.get(token, {}).items():
+                if key in hits:
+                    token_hits[key] = token_hits.get(key, 0.0) + weight
+            if not token_hits:
+                continue
+
+            # "pas content" must not count as heureux; it only weakens the overall confidence
+            if NEGATION_WORDS.intersection(tokens[max(0, index - NEGATION_WINDOW):index]):
+                negated_hits += sum(token_hits.values())
+                continue
+            for key, value in token_hits.items():
+                hits[key] += value
+
+    # Saturating scores in [0, 1], same scale as the Mistral JSON output
+    predictions = {key: 1 - math.exp(-value) for key, value in hits.items()}
+
+    top = max(hits.values())
+    if top < MIN_KEYWORD_HITS:
+        return predictions, 0.0
+
+    # Confident when there is enough evidence, one key clearly dominates and the
+    # keywords are not a handful of words lost in a long transcript
+    evidence = 1 - math.exp(-top / 2)
+    dominance = top / (sum(hits.values()) + negated_hits)
+    density = min(1.0, top * TOKENS_PER_HIT / token_count)
+    confidence = evidence * dominance * density
+
+    return predictions, confidence
+
+def _local_fast_path(transcribed_text, lexicon, category):
+    """Return local predictions when they can be used instead of Mistral, else None."""
+    mode = get_analysis_mode()
+    if mode == "remote":
+        return None
+
+    predictions, confidence = local_content_analysis(transcribed_text, lexicon, category)
+    if mode == "offline" or confidence >= get_local_confidence_threshold():
+        return softmax(predictions)
+
+    return None
+
 def speach_to_text(audio_path, language="fr"):
-    client = Groq(api_key=os.environ["GROQ_API_KEY"])
+    client = get_groq_client()
     with open(audio_path, "rb") as file:
 
         transcription = client.audio.transcriptions.create(
@@ -119,9 +429,7 @@ def speach_to_text(audio_path, language="fr"):
 
 def generate_image_prompt(transcribed_text):
     """Generate an image prompt from transcribed text using Mistral AI."""
-    import time
-    
-    client = Mistral(api_key=os.environ["MISTRAL_API_KEY"])
+    client = get_mistral_client()
     role_content = read_file("./role.txt")
     
     # Try with primary model first, fallback to smaller model
@@ -164,6 +472,7 @@ def generate_image_prompt(transcribed_text):
 
 def generate_image_with_clipdrop(prompt):
     """Generate an image using ClipDrop API."""
+    _load_environment()
     api_key = os.environ.get("CLIPDROP_API_KEY")
     if not api_key:
         raise ValueError("CLIPDROP_API_KEY not found in environment variables")
@@ -178,7 +487,7 @@ def generate_image_with_clipdrop(prompt):
         'x-api-key': api_key
     }
     
-    response = requests.post(url, files=files, headers=headers)
+    response = _lazy_import("requests").post(url, files=files, headers=headers)
     
     if response.ok:
         return response.content
@@ -187,7 +496,7 @@ def generate_image_with_clipdrop(prompt):
 
 def text_analysis(text):
 
-    client = Mistral(api_key=os.environ["MISTRAL_API_KEY"])
+    client = get_mistral_client()
 
     chat_response = client.chat.complete(
         model="mistral-large-latest",
@@ -226,7 +535,7 @@ def describe_image(image_input):
     if not base64_image:
         return "Erreur lors de l'encodage de l'image."
 
-    client = Mistral(api_key=os.environ["MISTRAL_API_KEY"])
+    client = get_mistral_client()
 
     messages = [
         {
@@ -287,9 +596,15 @@ def analyze_audio_text(transcribed_text):
 
 def analyze_content_emotions(transcribed_text):
     """Analyze emotions in transcribed text using Mistral AI."""
-    import time
+    return analyze_content_emotions_with_source(transcribed_text)[0]
+
+def analyze_content_emotions_with_source(transcribed_text):
+    """Analyze emotions and return (scores, source), source being "local" or "mistral"."""
+    local_analysis = _local_fast_path(transcribed_text, EMOTION_LEXICON, "emotions")
+    if local_analysis is not None:
+        return local_analysis, "local"
     
-    client = Mistral(api_key=os.environ["MISTRAL_API_KEY"])
+    client = get_mistral_client()
     
     # Try with primary model first, fallback to smaller model
     models_to_try = ["mistral-large-latest", "mistral-small-latest"]
@@ -315,7 +630,7 @@ def analyze_content_emotions(transcribed_text):
                 )
                 
                 predictions = json.loads(chat_response.choices[0].message.content)
-                return softmax(predictions)
+                return softmax(predictions), "mistral"
                 
             except Exception as e:
                 if "429" in str(e):
@@ -330,13 +645,20 @@ def analyze_content_emotions(transcribed_text):
                     raise e
     
     # If all models fail, raise the last error
+    
     raise Exception("All Mistral AI models are currently rate limited. Please try again later.")
 
 def analyze_content_themes(transcribed_text):
     """Analyze content themes and topics using Mistral AI."""
-    import time
+    return analyze_content_themes_with_source(transcribed_text)[0]
+
+def analyze_content_themes_with_source(transcribed_text):
+    """Analyze themes and return (scores, source), source being "local" or "mistral"."""
+    local_analysis = _local_fast_path(transcribed_text, THEME_LEXICON, "themes")
+    if local_analysis is not None:
+        return local_analysis, "local"
     
-    client = Mistral(api_key=os.environ["MISTRAL_API_KEY"])
+    client = get_mistral_client()
     
     # Try with primary model first, fallback to smaller model
     models_to_try = ["mistral-large-latest", "mistral-small-latest"]
@@ -370,7 +692,7 @@ def analyze_content_themes(transcribed_text):
                 )
                 
                 predictions = json.loads(chat_response.choices[0].message.content)
-                return softmax(predictions)
+                return softmax(predictions), "mistral"
                 
             except Exception as e:
                 if "429" in str(e):
@@ -385,6 +707,7 @@ def analyze_content_themes(transcribed_text):
                     raise e
     
     # If all models fail, raise the last error
+    
     raise Exception("All Mistral AI models are currently rate limited. Please try again later.")
 
 if __name__ == "__main__":